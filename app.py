@@ -13,6 +13,24 @@ import warnings
 
 warnings.filterwarnings('ignore')
 
+# Model input columns, in training order
+FEATURES = (
+    'Age', 'Sex', 'ChestPainType', 'RestingBP', 'Cholesterol', 'FastingBS',
+    'RestingECG', 'MaxHR', 'ExerciseAngina', 'Oldpeak', 'ST_Slope'
+)
+
+# Sidebar options, listed in the order of their model encoding
+SEX_OPTS = ("Female", "Male")
+YES_NO_OPTS = ("No", "Yes")
+CHEST_PAIN_OPTS = ("Typical Angina", "Atypical Angina", "Non-Anginal Pain", "Asymptomatic")
+RESTING_ECG_OPTS = ("Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy")
+ST_SLOPE_OPTS = ("Upsloping", "Flat", "Downsloping")
+
+# Categorical encodings used by the model
+CHEST_PAIN = {option: code for code, option in enumerate(CHEST_PAIN_OPTS)}
+RESTING_ECG = {option: code for code, option in enumerate(RESTING_ECG_OPTS)}
+ST_SLOPE = {option: code for code, option in enumerate(ST_SLOPE_OPTS)}
+
 # ========================
 # Configuration
 # ========================
@@ -25,8 +43,7 @@ st.set_page_config(
 # ========================
 # Custom CSS - Glassmorphism Theme
 # ========================
-def load_custom_css():
-    st.markdown("""
+CUSTOM_CSS = """
         <style>
         /* Import Google Fonts */
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
@@ -98,6 +115,15 @@ def load_custom_css():
             letter-spacing: 1px;
         }
         
+        .metric-row {
+            display: flex;
+            gap: 16px;
+        }
+        
+        .metric-row > .metric-card {
+            flex: 1;
+        }
+        
         /* Buttons */
         .stButton > button {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -157,7 +183,13 @@ def load_custom_css():
         footer {visibility: hidden;}
         
         </style>
-    """, unsafe_allow_html=True)
+"""
+
+def load_custom_css():
+    # Streamlit drops elements not re-emitted on a rerun, so the style block
+    # has to be sent every time; keeping it a module constant avoids
+    # rebuilding the string on each rerun.
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # ========================
 # Data Loading & Model Training
@@ -169,30 +201,35 @@ def load_and_train_model():
     In production, replace this with your actual dataset.
     """
     # Generate sample data (replace with your actual CSV loading)
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n_samples = 918
     
     # Feature generation
-    data = {
-        'Age': np.random.randint(28, 78, n_samples),
-        'Sex': np.random.choice([0, 1], n_samples),
-        'ChestPainType': np.random.choice([0, 1, 2, 3], n_samples),
-        'RestingBP': np.random.randint(90, 200, n_samples),
-        'Cholesterol': np.random.randint(0, 400, n_samples),
-        'FastingBS': np.random.choice([0, 1], n_samples),
-        'RestingECG': np.random.choice([0, 1, 2], n_samples),
-        'MaxHR': np.random.randint(60, 202, n_samples),
-        'ExerciseAngina': np.random.choice([0, 1], n_samples),
-        'Oldpeak': np.random.uniform(-2.6, 6.2, n_samples),
-        'ST_Slope': np.random.choice([0, 1, 2], n_samples),
-        'HeartDisease': np.random.choice([0, 1], n_samples)
+    # Integer columns as [low, high) ranges, drawn in a single int16 call
+    int_ranges = {
+        'Age': (28, 78),
+        'Sex': (0, 2),
+        'ChestPainType': (0, 4),
+        'RestingBP': (90, 200),
+        'Cholesterol': (0, 400),
+        'FastingBS': (0, 2),
+        'RestingECG': (0, 3),
+        'MaxHR': (60, 202),
+        'ExerciseAngina': (0, 2),
+        'ST_Slope': (0, 3),
+        'HeartDisease': (0, 2)
     }
+    low, high = np.array(list(int_ranges.values())).T
+    ints = rng.integers(low, high, size=(n_samples, len(int_ranges)), dtype=np.int16)
+    
+    data = dict(zip(int_ranges, ints.T))
+    data['Oldpeak'] = rng.uniform(-2.6, 6.2, n_samples).astype(np.float32)
     
     df = pd.DataFrame(data)
     
     # Split features and target
-    X = df.drop('HeartDisease', axis=1)
-    y = df['HeartDisease']
+    X = df[list(FEATURES)].to_numpy(dtype=np.float32)
+    y = df['HeartDisease'].to_numpy()
     
     # Train-test split
     X_train, X_test, y_train, y_test = train_test_split(
@@ -201,28 +238,89 @@ def load_and_train_model():
     
     # Train Random Forest model
     model = RandomForestClassifier(
-        n_estimators=100,
+        n_estimators=50,
         max_depth=6,
         min_samples_leaf=3,
+        n_jobs=1,
         random_state=42
     )
     model.fit(X_train, y_train)
     
-    return model, X.columns.tolist()
+    return model, list(FEATURES)
 
 # ========================
 # Input Validation
 # ========================
-def validate_input(name, value, min_val, max_val):
-    """Validate numeric input ranges"""
-    if value < min_val or value > max_val:
-        st.sidebar.error(f"⚠️ {name} must be between {min_val} and {max_val}")
-        return False
-    return True
+def validate_inputs(checks):
+    """Validate numeric input ranges, reporting all failures in one message"""
+    errors = [
+        f"⚠️ {name} must be between {min_val} and {max_val}"
+        for name, value, min_val, max_val in checks
+        if not min_val <= value <= max_val
+    ]
+    if errors:
+        st.sidebar.error("\n\n".join(errors))
+    return not errors
+
+# ========================
+# Fast Single-Sample Inference
+# ========================
+@st.cache_resource
+def compile_forest(_model, model_id):
+    """
+    Flatten a fitted forest into padded (n_trees, n_nodes) arrays.
+    Leaf values are normalized so they match each tree's predict_proba.
+    """
+    trees = [estimator.tree_ for estimator in _model.estimators_]
+    shape = (len(trees), max(tree.node_count for tree in trees))
+    
+    children_left = np.full(shape, -1, dtype=np.int32)
+    children_right = np.full(shape, -1, dtype=np.int32)
+    feature = np.zeros(shape, dtype=np.int32)
+    threshold = np.zeros(shape, dtype=np.float64)
+    value = np.zeros(shape + (_model.n_classes_,), dtype=np.float64)
+    
+    for i, tree in enumerate(trees):
+        n = tree.node_count
+        children_left[i, :n] = tree.children_left
+        children_right[i, :n] = tree.children_right
+        feature[i, :n] = np.maximum(tree.feature, 0)  # leaves store -2
+        threshold[i, :n] = tree.threshold
+        leaf_value = tree.value[:, 0, :]
+        value[i, :n] = leaf_value / leaf_value.sum(axis=1, keepdims=True)
+    
+    max_depth = max(tree.max_depth for tree in trees)
+    return children_left, children_right, feature, threshold, value, max_depth
+
+def predict_proba_fast(forest, x):
+    """
+    Class probabilities for a single sample.
+    Walks every tree one level at a time instead of dispatching per tree.
+    """
+    children_left, children_right, feature, threshold, value, max_depth = forest
+    trees = np.arange(len(children_left))
+    node = np.zeros(len(children_left), dtype=np.int32)
+    
+    for _ in range(max_depth):
+        go_left = x[feature[trees, node]] <= threshold[trees, node]
+        child = np.where(go_left, children_left[trees, node], children_right[trees, node])
+        node = np.where(child == -1, node, child)  # stay put once at a leaf
+    
+    return value[trees, node].mean(axis=0)
 
 # ========================
 # Visualization Functions
 # ========================
+# Charts are display-only, so skip Plotly's hover/zoom wiring and mode bar
+PLOTLY_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+def metric_card(label, value):
+    """HTML for a single result metric card"""
+    return (
+        f"<div class='metric-card'><div class='metric-label'>{label}</div>"
+        f"<div class='metric-value'>{value}</div></div>"
+    )
+
 def create_gauge_chart(probability, title, bar_color):
     """Create a beautiful gauge chart for probability display"""
     fig = go.Figure(go.Indicator(
@@ -241,12 +339,7 @@ def create_gauge_chart(probability, title, bar_color):
                 {'range': [0, 33], 'color': 'rgba(72, 187, 120, 0.3)'},
                 {'range': [33, 66], 'color': 'rgba(237, 137, 54, 0.3)'},
                 {'range': [66, 100], 'color': 'rgba(245, 101, 101, 0.3)'}
-            ],
-            'threshold': {
-                'line': {'color': "white", 'width': 4},
-                'thickness': 0.75,
-                'value': probability * 100
-            }
+            ]
         }
     ))
     
@@ -260,17 +353,27 @@ def create_gauge_chart(probability, title, bar_color):
     
     return fig
 
+@st.cache_data
+def top_feature_importance(_model, model_id, feature_names, top_n=8):
+    """Top feature importances, computed once per loaded model"""
+    # feature_importances_ averages over every tree on each access
+    importances = _model.feature_importances_
+    # Select the top features in O(n), then sort only those
+    top_n = min(top_n, len(importances))
+    indices = np.argpartition(importances, -top_n)[-top_n:]
+    indices = indices[np.argsort(importances[indices])[::-1]]
+    return importances[indices], [feature_names[i] for i in indices]
+
 def create_feature_importance_chart(model, feature_names):
     """Create feature importance bar chart"""
-    importances = model.feature_importances_
-    indices = np.argsort(importances)[::-1][:8]  # Top 8 features
+    values, names = top_feature_importance(model, id(model), tuple(feature_names))
     
     fig = go.Figure(go.Bar(
-        x=importances[indices],
-        y=[feature_names[i] for i in indices],
+        x=values,
+        y=names,
         orientation='h',
         marker=dict(
-            color=importances[indices],
+            color=values,
             colorscale='Viridis',
             line=dict(color='rgba(255, 255, 255, 0.3)', width=1)
         )
@@ -295,6 +398,49 @@ def create_feature_importance_chart(model, feature_names):
 # ========================
 # Main Application
 # ========================
+def render_welcome():
+    """Default view shown until a prediction is requested"""
+    st.markdown("""
+        <div class='glass-card' style='text-align: center; padding: 60px;'>
+            <h2 style='margin-bottom: 20px;'>Welcome to Heart Failure Prediction System</h2>
+            <p style='font-size: 1.1rem; color: rgba(255, 255, 255, 0.7); line-height: 1.8;'>
+                This advanced AI-powered system uses machine learning to assess cardiovascular risk.
+                <br><br>
+                👈 Please enter patient information in the sidebar and click <strong>"Predict Risk"</strong> to begin.
+                <br><br>
+                Our Random Forest model analyzes 11 key health indicators to provide accurate predictions.
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # Feature Overview
+    st.markdown("### 📌 Features Analyzed")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+            - Age
+            - Sex
+            - Chest Pain Type
+            - Resting Blood Pressure
+        """)
+    
+    with col2:
+        st.markdown("""
+            - Cholesterol
+            - Fasting Blood Sugar
+            - Resting ECG
+            - Maximum Heart Rate
+        """)
+    
+    with col3:
+        st.markdown("""
+            - Exercise-Induced Angina
+            - ST Depression (Oldpeak)
+            - ST Slope
+        """)
+
 def main():
     load_custom_css()
     
@@ -324,7 +470,7 @@ def main():
         # Demographic Information
         st.markdown("#### 👤 Demographics")
         age = st.number_input("Age (years)", min_value=1, max_value=120, value=50, step=1)
-        sex = st.selectbox("Sex", options=["Female", "Male"])
+        sex = st.selectbox("Sex", options=SEX_OPTS)
         
         st.markdown("---")
         
@@ -332,13 +478,13 @@ def main():
         st.markdown("#### 🩺 Clinical Measurements")
         chest_pain = st.selectbox(
             "Chest Pain Type",
-            options=["Typical Angina", "Atypical Angina", "Non-Anginal Pain", "Asymptomatic"]
+            options=CHEST_PAIN_OPTS
         )
         resting_bp = st.number_input("Resting Blood Pressure (mm Hg)", 
                                       min_value=50, max_value=250, value=120, step=1)
         cholesterol = st.number_input("Cholesterol (mg/dL)", 
                                        min_value=0, max_value=600, value=200, step=1)
-        fasting_bs = st.selectbox("Fasting Blood Sugar > 120 mg/dL", options=["No", "Yes"])
+        fasting_bs = st.selectbox("Fasting Blood Sugar > 120 mg/dL", options=YES_NO_OPTS)
         
         st.markdown("---")
         
@@ -346,16 +492,16 @@ def main():
         st.markdown("#### 📊 ECG & Exercise Data")
         resting_ecg = st.selectbox(
             "Resting ECG",
-            options=["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"]
+            options=RESTING_ECG_OPTS
         )
         max_hr = st.number_input("Maximum Heart Rate", 
                                  min_value=60, max_value=220, value=150, step=1)
-        exercise_angina = st.selectbox("Exercise-Induced Angina", options=["No", "Yes"])
+        exercise_angina = st.selectbox("Exercise-Induced Angina", options=YES_NO_OPTS)
         oldpeak = st.number_input("ST Depression (Oldpeak)", 
                                   min_value=-5.0, max_value=10.0, value=0.0, step=0.1)
         st_slope = st.selectbox(
             "ST Slope",
-            options=["Upsloping", "Flat", "Downsloping"]
+            options=ST_SLOPE_OPTS
         )
         
         st.markdown("---")
@@ -367,169 +513,114 @@ def main():
     # Main Content Area
     # ========================
     
+    if not predict_button:
+        render_welcome()
+        return
+    
     # Input validation
-    all_valid = True
-    all_valid &= validate_input("Age", age, 1, 120)
-    all_valid &= validate_input("Resting BP", resting_bp, 50, 250)
-    all_valid &= validate_input("Cholesterol", cholesterol, 0, 600)
-    all_valid &= validate_input("Max Heart Rate", max_hr, 60, 220)
-    all_valid &= validate_input("Oldpeak", oldpeak, -5.0, 10.0)
-    
-    if predict_button and all_valid:
-        # Prepare input data
-        input_data = pd.DataFrame({
-            'Age': [age],
-            'Sex': [1 if sex == "Male" else 0],
-            'ChestPainType': [["Typical Angina", "Atypical Angina", "Non-Anginal Pain", "Asymptomatic"].index(chest_pain)],
-            'RestingBP': [resting_bp],
-            'Cholesterol': [cholesterol],
-            'FastingBS': [1 if fasting_bs == "Yes" else 0],
-            'RestingECG': [["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"].index(resting_ecg)],
-            'MaxHR': [max_hr],
-            'ExerciseAngina': [1 if exercise_angina == "Yes" else 0],
-            'Oldpeak': [oldpeak],
-            'ST_Slope': [["Upsloping", "Flat", "Downsloping"].index(st_slope)]
-        })
-        
-        # Make prediction
-        prediction = model.predict(input_data)[0]
-        probability = model.predict_proba(input_data)[0]
-        
-        # Display Results
-        st.markdown("## 📊 Prediction Results")
-        
-        # Result Cards
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-                <div class='metric-card'>
-                    <div class='metric-label'>Diagnosis</div>
-                    <div class='metric-value'>{}</div>
-                </div>
-            """.format("At Risk" if prediction == 1 else "Healthy"), unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-                <div class='metric-card'>
-                    <div class='metric-label'>Confidence</div>
-                    <div class='metric-value'>{:.1f}%</div>
-                </div>
-            """.format(max(probability) * 100), unsafe_allow_html=True)
-        
-        with col3:
-            risk_level = "High" if max(probability) > 0.7 else "Medium" if max(probability) > 0.4 else "Low"
-            st.markdown("""
-                <div class='metric-card'>
-                    <div class='metric-label'>Risk Level</div>
-                    <div class='metric-value'>{}</div>
-                </div>
-            """.format(risk_level), unsafe_allow_html=True)
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Gauge Charts
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig1 = create_gauge_chart(
-                probability[0], 
-                "Healthy Probability",
-                "#48bb78"  # Green color
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-        
-        with col2:
-            fig2 = create_gauge_chart(
-                probability[1], 
-                "Heart Disease Probability",
-                "#f56565"  # Red color
-            )
-            st.plotly_chart(fig2, use_container_width=True)
-        
-        # Feature Importance
-        st.markdown("---")
-        st.markdown("## 🎯 Key Risk Factors")
-        fig3 = create_feature_importance_chart(model, feature_names)
-        st.plotly_chart(fig3, use_container_width=True)
-        
-        # Recommendations
-        st.markdown("---")
-        st.markdown("## 💡 Recommendations")
-        
-        if prediction == 1:
-            st.error("""
-                **⚠️ Heart Disease Risk Detected**
-                
-                Based on the provided information, the model indicates an elevated risk of heart disease.
-                We recommend:
-                - Schedule an appointment with a cardiologist immediately
-                - Undergo comprehensive cardiovascular screening
-                - Discuss lifestyle modifications and treatment options
-                - Monitor vital signs regularly
-            """)
-        else:
-            st.success("""
-                **✅ Low Risk Detected**
-                
-                The model indicates a lower risk of heart disease. However:
-                - Continue regular health check-ups
-                - Maintain a healthy lifestyle with proper diet and exercise
-                - Monitor blood pressure and cholesterol levels
-                - Stay informed about cardiovascular health
-            """)
-        
-        st.info("""
-            **📌 Important Note:** This prediction is based on machine learning algorithms and should not 
-            replace professional medical advice. Always consult with healthcare professionals for 
-            accurate diagnosis and treatment.
-        """)
+    all_valid = validate_inputs([
+        ("Age", age, 1, 120),
+        ("Resting BP", resting_bp, 50, 250),
+        ("Cholesterol", cholesterol, 0, 600),
+        ("Max Heart Rate", max_hr, 60, 220),
+        ("Oldpeak", oldpeak, -5.0, 10.0)
+    ])
     
-    elif not all_valid:
+    if not all_valid:
         st.warning("⚠️ Please correct the input values highlighted in the sidebar.")
+        return
+    
+    # Prepare input data
+    input_data = np.array([[
+        age,
+        1 if sex == "Male" else 0,
+        CHEST_PAIN[chest_pain],
+        resting_bp,
+        cholesterol,
+        1 if fasting_bs == "Yes" else 0,
+        RESTING_ECG[resting_ecg],
+        max_hr,
+        1 if exercise_angina == "Yes" else 0,
+        oldpeak,
+        ST_SLOPE[st_slope]
+    ]], dtype=np.float32)
+    
+    # Make prediction
+    probability = predict_proba_fast(compile_forest(model, id(model)), input_data[0])
+    prediction = int(probability.argmax())
+    confidence = probability[prediction]
     
+    # Display Results
+    st.markdown("## 📊 Prediction Results")
+    
+    # Result Cards
+    risk_level = "High" if confidence > 0.7 else "Medium" if confidence > 0.4 else "Low"
+    st.markdown(f"""
+        <div class='metric-row'>
+            {metric_card("Diagnosis", "At Risk" if prediction == 1 else "Healthy")}
+            {metric_card("Confidence", f"{confidence * 100:.1f}%")}
+            {metric_card("Risk Level", risk_level)}
+        </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Gauge Charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig1 = create_gauge_chart(
+            probability[0], 
+            "Healthy Probability",
+            "#48bb78"  # Green color
+        )
+        st.plotly_chart(fig1, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    with col2:
+        fig2 = create_gauge_chart(
+            probability[1], 
+            "Heart Disease Probability",
+            "#f56565"  # Red color
+        )
+        st.plotly_chart(fig2, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # Feature Importance
+    st.markdown("---")
+    st.markdown("## 🎯 Key Risk Factors")
+    fig3 = create_feature_importance_chart(model, feature_names)
+    st.plotly_chart(fig3, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # Recommendations
+    st.markdown("---")
+    st.markdown("## 💡 Recommendations")
+    
+    if prediction == 1:
+        st.error("""
+            **⚠️ Heart Disease Risk Detected**
+            
+            Based on the provided information, the model indicates an elevated risk of heart disease.
+            We recommend:
+            - Schedule an appointment with a cardiologist immediately
+            - Undergo comprehensive cardiovascular screening
+            - Discuss lifestyle modifications and treatment options
+            - Monitor vital signs regularly
+        """)
     else:
-        # Default view when no prediction is made
-        st.markdown("""
-            <div class='glass-card' style='text-align: center; padding: 60px;'>
-                <h2 style='margin-bottom: 20px;'>Welcome to Heart Failure Prediction System</h2>
-                <p style='font-size: 1.1rem; color: rgba(255, 255, 255, 0.7); line-height: 1.8;'>
-                    This advanced AI-powered system uses machine learning to assess cardiovascular risk.
-                    <br><br>
-                    👈 Please enter patient information in the sidebar and click <strong>"Predict Risk"</strong> to begin.
-                    <br><br>
-                    Our Random Forest model analyzes 11 key health indicators to provide accurate predictions.
-                </p>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Feature Overview
-        st.markdown("### 📌 Features Analyzed")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-                - Age
-                - Sex
-                - Chest Pain Type
-                - Resting Blood Pressure
-            """)
-        
-        with col2:
-            st.markdown("""
-                - Cholesterol
-                - Fasting Blood Sugar
-                - Resting ECG
-                - Maximum Heart Rate
-            """)
-        
-        with col3:
-            st.markdown("""
-                - Exercise-Induced Angina
-                - ST Depression (Oldpeak)
-                - ST Slope
-            """)
+        st.success("""
+            **✅ Low Risk Detected**
+            
+            The model indicates a lower risk of heart disease. However:
+            - Continue regular health check-ups
+            - Maintain a healthy lifestyle with proper diet and exercise
+            - Monitor blood pressure and cholesterol levels
+            - Stay informed about cardiovascular health
+        """)
+    
+    st.info("""
+        **📌 Important Note:** This prediction is based on machine learning algorithms and should not 
+        replace professional medical advice. Always consult with healthcare professionals for 
+        accurate diagnosis and treatment.
+    """)
 
 if __name__ == "__main__":
     main()
@@ -5,12 +5,36 @@ This script helps you integrate your trained model from the Jupyter notebook.
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import OrdinalEncoder
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 import joblib
 
-def train_and_save_model(csv_path='heart.csv', model_output='heart_model.pkl'):
+# Column dtypes of heart.csv, so pandas can skip type inference
+CSV_DTYPES = {
+    'Age': 'int16',
+    'Sex': 'category',
+    'ChestPainType': 'category',
+    'RestingBP': 'int16',
+    'Cholesterol': 'int16',
+    'FastingBS': 'int8',
+    'RestingECG': 'category',
+    'MaxHR': 'int16',
+    'ExerciseAngina': 'category',
+    'Oldpeak': 'float32',
+    'ST_Slope': 'category',
+    'HeartDisease': 'int8'
+}
+
+# Category order for each categorical column; codes match the app's sidebar options
+CATEGORIES = {
+    'Sex': ['F', 'M'],
+    'ChestPainType': ['TA', 'ATA', 'NAP', 'ASY'],
+    'RestingECG': ['Normal', 'ST', 'LVH'],
+    'ExerciseAngina': ['N', 'Y'],
+    'ST_Slope': ['Up', 'Flat', 'Down']
+}
+
+def train_and_save_model(csv_path='heart.csv', model_output='heart_model.pkl', compress=0):
     """
     Train the Random Forest model using your actual dataset and save it.
     
@@ -20,6 +44,9 @@ def train_and_save_model(csv_path='heart.csv', model_output='heart_model.pkl'):
         Path to your heart.csv file
     model_output : str
         Path where the trained model will be saved
+    compress : int
+        joblib compression level (0-9). Leave at 0 for deployment so the app
+        can memory-map the file; use e.g. 3 for a smaller file to transfer
     
     Returns:
     --------
@@ -30,23 +57,24 @@ def train_and_save_model(csv_path='heart.csv', model_output='heart_model.pkl'):
     """
     
     print("Loading dataset...")
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(csv_path, dtype=CSV_DTYPES)
     
     print(f"Dataset shape: {df.shape}")
     print(f"Columns: {df.columns.tolist()}")
     
     # Encode categorical features
     print("\nEncoding categorical features...")
-    encoder = OrdinalEncoder()
-    categorical = ['Sex', 'ChestPainType', 'RestingECG', 'ExerciseAngina', 'ST_Slope']
-    df[categorical] = encoder.fit_transform(df[categorical])
     df = df.dropna()
+    for col, categories in CATEGORIES.items():
+        codes = pd.Categorical(df[col], categories=categories).codes.astype('int8')
+        if (codes == -1).any():
+            raise ValueError(f"Unexpected {col} values; expected one of {categories}")
+        df[col] = codes
     
-    # Split features and target
-    X = df.drop('HeartDisease', axis=1)
-    y = df['HeartDisease']
-    
-    feature_names = X.columns.tolist()
+    # Split features and target as NumPy arrays (trees work in float32)
+    feature_names = [c for c in df.columns if c != 'HeartDisease']
+    X = df[feature_names].to_numpy(dtype=np.float32)
+    y = df['HeartDisease'].to_numpy(dtype=np.int8)
     
     # Train-test split
     print("\nSplitting data...")
@@ -76,10 +104,9 @@ def train_and_save_model(csv_path='heart.csv', model_output='heart_model.pkl'):
     print(f"\nSaving model to {model_output}...")
     model_data = {
         'model': model,
-        'feature_names': feature_names,
-        'encoder': encoder
+        'feature_names': feature_names
     }
-    joblib.dump(model_data, model_output)
+    joblib.dump(model_data, model_output, compress=compress)
     
     print("✅ Model saved successfully!")
     print(f"\nTo use this model in the app, update the load_and_train_model() function:")
@@ -102,13 +129,11 @@ def load_saved_model(model_path='heart_model.pkl'):
         Trained model
     feature_names : list
         List of feature names
-    encoder : OrdinalEncoder
-        Fitted encoder
     """
     print(f"Loading model from {model_path}...")
-    model_data = joblib.load(model_path)
+    model_data = joblib.load(model_path, mmap_mode='r')
     
-    return model_data['model'], model_data['feature_names'], model_data['encoder']
+    return model_data['model'], model_data['feature_names']
 
 # Example usage
 if __name__ == "__main__":
@@ -125,7 +150,7 @@ if __name__ == "__main__":
     # )
     
     # Option 2: Load an existing model
-    # model, features, encoder = load_saved_model('heart_model.pkl')
+    # model, features = load_saved_model('heart_model.pkl')
     # print(f"Model loaded with {len(features)} features")
     
     print("\n" + "="*60)